@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 import csv
-import re
+import functools
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# Inputs smaller than this are converted by the pure-Python loop, which
+# finishes before numba would have been imported and its kernels loaded
+NUMBA_MIN_BYTES = 16 << 20
+
 
 def parse_mixed_date(date_str: str) -> datetime:
     """
     Parse a date string that can be either:
-      - YYYY-MM-DD  (e.g., 2015-01-01)
+      - YYYY-DD-MM  (e.g., 2015-02-01 for 2 Jan 2015, as found in
+                     stock_data.csv where day and month are swapped)
       - MM-DD-YYYY  (e.g., 01-13-2015)
 
     Returns a datetime.datetime object.
@@ -18,25 +23,191 @@ def parse_mixed_date(date_str: str) -> datetime:
     """
     s = date_str.strip()
 
-    # Format 1: YYYY-MM-DD
-    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", s):
-        return datetime.strptime(s, "%Y-%d-%m")
+    # Both formats are fixed-width, so the fields can be sliced out directly
+    if len(s) == 10 and s.isascii():
+        # Format 1: YYYY-DD-MM
+        if s[4] == "-" and s[7] == "-":
+            y, d, m = s[0:4], s[5:7], s[8:10]
+        # Format 2: MM-DD-YYYY
+        elif s[2] == "-" and s[5] == "-":
+            m, d, y = s[0:2], s[3:5], s[6:10]
+        else:
+            y = m = d = ""
 
-    # Format 2: MM-DD-YYYY
-    if re.fullmatch(r"\d{2}-\d{2}-\d{4}", s):
-        return datetime.strptime(s, "%m-%d-%Y")
+        if y.isdigit() and m.isdigit() and d.isdigit():
+            # datetime() rejects out-of-range days/months with ValueError
+            return datetime(int(y), int(m), int(d))
 
     raise ValueError(f"Unknown date format: {date_str!r}")
 
 
-def convert_file(in_path: str, out_path: str) -> None:
+# Kernels over the bytes of the whole input, compiled by _compile_kernels
+def _parse_digits(buf, pos, width):
+    """Parse `width` ASCII digits starting at `pos`, or return -1."""
+    value = 0
+    for k in range(pos, pos + width):
+        c = buf[k] - 48
+        if c < 0 or c > 9:
+            return -1
+        value = value * 10 + c
+    return value
+
+
+def _is_padding(c):
+    """Whether str.strip() might remove this byte from a field's edge."""
+    return c == 9 or 11 <= c <= 13 or 28 <= c <= 32 or c >= 128
+
+
+def _parse_dates(buf, starts):
     """
-    Convert the first-column date in each row to DD/MM/YYYY
-    without changing the row order.
+    Parse the first field of every line starting at `starts`.
+
+    Returns (years, months, days); the year is 0 for lines whose first
+    field is not exactly one of the formats accepted by parse_mixed_date,
+    and -1 for lines whose first field may be padded with whitespace and
+    must be converted by the Python path instead.
     """
-    in_path = Path(in_path)
-    out_path = Path(out_path)
+    n = starts.size
+    years = np.zeros(n, np.int32)
+    months = np.zeros(n, np.int32)
+    days = np.zeros(n, np.int32)
+
+    for i in range(n):
+        p = starts[i]
+        end = p
+        while end < buf.size and buf[end] != 44 and buf[end] != 10:
+            end += 1
+        if end > p and (_is_padding(buf[p]) or _is_padding(buf[end - 1])):
+            years[i] = -1
+            continue
+        # The date must be the whole first field
+        if end - p != 10:
+            continue
+
+        if buf[p + 4] == 45 and buf[p + 7] == 45:  # YYYY-DD-MM
+            y = _parse_digits(buf, p, 4)
+            d = _parse_digits(buf, p + 5, 2)
+            m = _parse_digits(buf, p + 8, 2)
+        elif buf[p + 2] == 45 and buf[p + 5] == 45:  # MM-DD-YYYY
+            m = _parse_digits(buf, p, 2)
+            d = _parse_digits(buf, p + 3, 2)
+            y = _parse_digits(buf, p + 6, 4)
+        else:
+            continue
+
+        if y < 1 or m < 1 or m > 12 or d < 1:
+            continue
+        if m == 2:
+            leap = y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+            max_day = 29 if leap else 28
+        elif m == 4 or m == 6 or m == 9 or m == 11:
+            max_day = 30
+        else:
+            max_day = 31
+        if d > max_day:
+            continue
 
+        years[i] = y
+        months[i] = m
+        days[i] = d
+
+    return years, months, days
+
+
+def _format_dates(buf, starts, years, months, days):
+    """Overwrite each parsed date in place with its DD/MM/YYYY form."""
+    for i in range(starts.size):
+        y = years[i]
+        if y <= 0:
+            continue
+        p = starts[i]
+        buf[p] = 48 + days[i] // 10
+        buf[p + 1] = 48 + days[i] % 10
+        buf[p + 2] = 47
+        buf[p + 3] = 48 + months[i] // 10
+        buf[p + 4] = 48 + months[i] % 10
+        buf[p + 5] = 47
+        buf[p + 6] = 48 + y // 1000
+        buf[p + 7] = 48 + y // 100 % 10
+        buf[p + 8] = 48 + y // 10 % 10
+        buf[p + 9] = 48 + y % 10
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_kernels() -> bool:
+    """
+    Replace the kernels above with their numba-compiled versions, once.
+
+    Returns False if numba is not installed.
+    """
+    global np, _parse_digits, _is_padding, _parse_dates, _format_dates
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return False
+
+    # Each kernel is compiled after the ones it calls
+    _parse_digits = njit("i4(u1[:], i8, i8)", cache=True, boundscheck=False)(_parse_digits)
+    _is_padding = njit("b1(u1)", cache=True)(_is_padding)
+    _parse_dates = njit("Tuple((i4[:], i4[:], i4[:]))(u1[:], i8[:])", cache=True, boundscheck=False)(_parse_dates)
+    _format_dates = njit("void(u1[:], i8[:], i4[:], i4[:], i4[:])", cache=True, boundscheck=False)(_format_dates)
+    return True
+
+
+def _convert_buffer(data: bytes) -> bytes:
+    """
+    Convert every first-field date in `data` with the compiled kernels.
+
+    Every supported input format and the DD/MM/YYYY output are 10 bytes
+    wide, so the conversion is done in place on a copy of the buffer.
+    """
+    # Normalise line endings and drop blank lines, like the Python path
+    data = data.replace(b"\r\n", b"\n")
+    while b"\n\n" in data:
+        data = data.replace(b"\n\n", b"\n")
+    data = data.lstrip(b"\n")
+    if data and not data.endswith(b"\n"):
+        data += b"\n"
+
+    buf = np.frombuffer(bytearray(data), dtype=np.uint8)
+    newlines = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], newlines[:-1] + 1)).astype(np.int64)
+
+    years, months, days = _parse_dates(buf, starts)
+    _format_dates(buf, starts, years, months, days)
+    data = buf.tobytes()
+
+    # Dates padded with whitespace are stripped and converted in Python
+    padded = np.flatnonzero(years < 0)
+    if padded.size:
+        lines = data.split(b"\n")
+        for i in padded:
+            lines[i] = _convert_line(lines[i])
+        data = b"\n".join(lines)
+    return data
+
+
+def _convert_line(line: bytes) -> bytes:
+    """Convert the date in the first field of one line, if it has one."""
+    first_field, sep, rest = line.partition(b",")
+
+    # Attempt to convert date formats
+    try:
+        dt = parse_mixed_date(first_field.decode("utf-8"))
+        first_field = f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d}".encode()
+    except ValueError:
+        # Not an expected date format -> leave row unchanged
+        pass
+
+    return first_field + sep + rest
+
+
+def _convert_rows(in_path: Path, out_path: Path) -> None:
+    """
+    Convert the first-column date in each row with the csv module, for
+    files whose quoting or line breaks the fast paths do not reproduce.
+    """
     with in_path.open(newline="", encoding="utf-8") as fin, out_path.open(
         "w", newline="", encoding="utf-8"
     ) as fout:
@@ -48,12 +219,10 @@ def convert_file(in_path: str, out_path: str) -> None:
             if not row:
                 continue
 
-            first_field = row[0].strip()
-
             # Attempt to convert date formats
             try:
-                dt = parse_mixed_date(first_field)
-                row[0] = dt.strftime("%d/%m/%Y")
+                dt = parse_mixed_date(row[0])
+                row[0] = f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d}"
             except ValueError:
                 # Not an expected date format -> leave row unchanged
                 pass
@@ -61,6 +230,39 @@ def convert_file(in_path: str, out_path: str) -> None:
             writer.writerow(row)
 
 
+def convert_file(in_path: str, out_path: str) -> None:
+    """
+    Convert the first-column date in each row to DD/MM/YYYY
+    without changing the row order.
+
+    Only the first field can change, so each line is split once at the
+    first comma instead of being tokenized by the csv module. When numba
+    is installed, files of at least NUMBA_MIN_BYTES are converted by
+    compiled kernels. Rows end in CRLF, as csv.writer writes them. Files
+    containing quotes or bare carriage returns are still read and written
+    by the csv module, which unquotes and re-quotes their fields.
+    """
+    in_path = Path(in_path)
+    out_path = Path(out_path)
+
+    data = in_path.read_bytes()
+    if b'"' in data or data.count(b"\r") != data.count(b"\r\n"):
+        _convert_rows(in_path, out_path)
+        return
+
+    with out_path.open("wb", buffering=1 << 20) as fout:
+        if len(data) >= NUMBA_MIN_BYTES and _compile_kernels():
+            fout.write(_convert_buffer(data).replace(b"\n", b"\r\n"))
+            return
+
+        for line in data.split(b"\n"):
+            line = line.rstrip(b"\r")
+            if not line:
+                continue
+
+            fout.write(_convert_line(line) + b"\r\n")
+
+
 if __name__ == "__main__":
     if len(sys.argv) != 3:
         print("Usage: python convert_dates.py <input_file> <output_file>")
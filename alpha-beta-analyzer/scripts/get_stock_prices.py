@@ -10,6 +10,7 @@ Usage:
 """
 
 import argparse
+import re
 import sys
 from datetime import datetime
 import pandas as pd
@@ -21,6 +22,10 @@ except ImportError:
     sys.exit(1)
 
 
+# Exchange suffixes and the index prefix stripped from column names
+_TICKER_DECORATION_RE = re.compile(r'\.NS|\.BO|\^')
+
+
 def parse_date(date_str):
     """Parse date string in mm-dd-yyyy format."""
     try:
@@ -61,26 +66,28 @@ def download_stock_data(symbols, start_date, end_date):
     if data.empty:
         raise ValueError("No data downloaded. Check your ticker symbols and date range.")
 
-    # Extract closing prices
-    closing_prices = pd.DataFrame()
-
-    if len(symbols) == 1:
-        # Single symbol case
-        closing_prices[symbols[0]] = data['Close']
+    # Extract closing prices for all symbols in a single slice
+    if isinstance(data.columns, pd.MultiIndex):
+        # group_by='ticker' gives (ticker, field) column pairs
+        close = data.xs('Close', level=1, axis=1)
     else:
-        # Multiple symbols case
-        for symbol in symbols:
-            try:
-                closing_prices[symbol] = data[symbol]['Close']
-            except KeyError:
-                print(f"Warning: No data found for {symbol}")
+        # Single symbol case
+        close = data[['Close']].set_axis(symbols[:1], axis=1)
+
+    closing_prices = close.reindex(columns=symbols)
+
+    # Symbols without any data come back as all-NaN columns
+    no_data = closing_prices.columns[closing_prices.isna().all()]
+    for symbol in no_data:
+        print(f"Warning: No data found for {symbol}")
+    closing_prices = closing_prices.drop(columns=no_data)
 
     # Reset index to make Date a column
     closing_prices.reset_index(inplace=True)
 
     # Rename Date column and format it
     closing_prices.rename(columns={'Date': 'Date'}, inplace=True)
-    closing_prices['Date'] = closing_prices['Date'].apply(format_date)
+    closing_prices['Date'] = closing_prices['Date'].dt.strftime('%m-%d-%Y')
 
     # Remove any rows with all NaN values (except Date)
     closing_prices.dropna(how='all', subset=closing_prices.columns[1:], inplace=True)
@@ -100,21 +107,8 @@ def clean_column_names(df, stocks, index_name):
     Returns:
         DataFrame with cleaned column names
     """
-    rename_map = {}
-
-    # Create a mapping to clean up ticker names
-    for col in df.columns:
-        if col == 'Date':
-            continue
-
-        # Remove common suffixes like .NS, .BO, ^NSEI, etc.
-        clean_name = col.replace('.NS', '').replace('.BO', '').replace('^', '')
-
-        # If it's the index, name it appropriately
-        if col == index_name:
-            clean_name = clean_name if '^' not in index_name else clean_name
-
-        rename_map[col] = clean_name
+    # Remove common suffixes like .NS, .BO, ^NSEI, etc. in a single pass
+    rename_map = {col: _TICKER_DECORATION_RE.sub('', col) for col in df.columns if col != 'Date'}
 
     df.rename(columns=rename_map, inplace=True)
     return df
@@ -221,8 +215,9 @@ Stock Symbol Format:
         if not args.keep_suffixes:
             df = clean_column_names(df, stock_list, index_symbol)
 
-        # Save to CSV
-        df.to_csv(args.output, index=False)
+        # Save to CSV through a large write buffer
+        with open(args.output, 'w', buffering=1 << 20, newline='', encoding='utf-8') as f:
+            df.to_csv(f, index=False, chunksize=100_000)
 
         print("\n" + "="*60)
         print(f"✓ Data downloaded successfully!")
@@ -241,11 +236,10 @@ Stock Symbol Format:
         print(f"  Total trading days: {len(df)}")
         print(f"  Date coverage: {(end_date - start_date).days} days")
         print(f"  Missing values per column:")
-        for col in df.columns:
-            if col != 'Date':
-                missing = df[col].isna().sum()
-                if missing > 0:
-                    print(f"    {col}: {missing} ({missing/len(df)*100:.1f}%)")
+        missing_counts = df.drop(columns=['Date']).isna().sum()
+        for col, missing in missing_counts.items():
+            if missing > 0:
+                print(f"    {col}: {missing} ({missing/len(df)*100:.1f}%)")
 
         print("\n✓ File is ready to upload to Stock Alpha & Beta Analyzer!")
         print(f"  Upload {args.output} to the analyzer application.\n")
@@ -19,51 +19,213 @@ Usage:
 """
 
 import argparse
+import contextlib
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
+import numpy as np
 import pandas as pd
 import os
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    # pyarrow is optional; read_stock_csv and write_stock_csv fall back to pandas' own
+    # C parser and writer
+    pa = None
 
-def parse_date_with_multiple_formats(date_str):
+
+# Input date formats recognized by standardize_dates, in order of preference,
+# each with the prefix a date must start with to possibly be in that format
+INPUT_DATE_FORMATS = {
+    '%Y-%m-%d': re.compile(r'\d{4}-'),      # yyyy-mm-dd (e.g., 2015-01-13)
+    '%m-%d-%Y': re.compile(r'\d{1,2}-'),    # mm-dd-yyyy (e.g., 01-13-2015)
+}
+
+# Strings read_csv treats as missing by default; pyarrow's own list lacks
+# 'None' and '<NA>'
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# Rules drawn around the report and under its section headings
+REPORT_RULE = "=" * 70
+SECTION_RULE = "-" * 70
+
+
+def read_stock_csv(path):
     """
-    Parse date string trying yyyy-mm-dd and mm-dd-yyyy formats only.
+    Read a stock CSV, with pyarrow's multi-threaded parser where possible.
 
     Args:
-        date_str: Date string to parse
+        path: Input CSV file path
 
     Returns:
-        datetime object or None if parsing fails
+        DataFrame with the file contents, with Date as strings
     """
-    date_formats = [
-        '%Y-%m-%d',    # yyyy-mm-dd (e.g., 2015-01-13)
-        '%m-%d-%Y',    # mm-dd-yyyy (e.g., 01-13-2015)
-    ]
+    # Empty files cannot be mapped; let the C parser report them
+    if os.path.getsize(path) == 0:
+        return pd.read_csv(path)
 
-    for fmt in date_formats:
+    if pa is not None:
         try:
-            return datetime.strptime(str(date_str), fmt)
-        except ValueError:
-            continue
+            # Date stays a string for standardize_dates; pyarrow would parse ISO dates itself
+            convert_options = pacsv.ConvertOptions(
+                column_types={'Date': pa.string()}, null_values=CSV_NA_VALUES,
+                strings_can_be_null=True)
+            with pa.memory_map(path) as source:
+                table = pacsv.read_csv(source, convert_options=convert_options)
+            numeric = all(pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                          for field in table.schema if field.name != 'Date')
+            # read_csv renames repeated columns and reads other columns differently
+            if numeric and len(set(table.column_names)) == table.num_columns:
+                return table.to_pandas(types_mapper=pd.ArrowDtype)
+        except pa.ArrowInvalid:
+            # Malformed files get the C parser's error messages
+            pass
+
+    return pd.read_csv(path, memory_map=True)
+
+
+def write_stock_csv(df, f, header=True, use_pyarrow=True):
+    """
+    Write a stock DataFrame to CSV, with pyarrow's writer where possible.
+
+    Args:
+        df: DataFrame to write
+        f: Output file, opened in binary mode; the rows are appended to it
+        header: Whether to write the column names first
+        use_pyarrow: Whether to try pyarrow's writer before pandas'
+
+    Returns:
+        bool: True if the rows were written by pyarrow, False if by pandas
+    """
+    if use_pyarrow and pa is not None:
+        start = f.tell()
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # pyarrow spells booleans true/false, quotes the header, and refuses
+            # values that need quotes when quoting is off
+            if not any(pa.types.is_boolean(field.type) for field in table.schema):
+                write_options = pacsv.WriteOptions(include_header=False, quoting_style='none', eol=os.linesep)
+                if header:
+                    f.write(df.head(0).to_csv(index=False).encode('utf-8'))
+                pacsv.write_csv(table, f, write_options)
+                return True
+        except (pa.ArrowInvalid, TypeError):
+            # TypeError covers pa.ArrowTypeError and pyarrow releases without
+            # the eol option. Drop any rows pyarrow wrote before it failed.
+            f.seek(start)
+            f.truncate()
+
+    df.to_csv(f, index=False, header=header, chunksize=100_000)
+    return False
+
+
+def candidate_date_format(date_str):
+    """
+    Pick the only input format a date string could be in from its prefix.
+
+    The supported formats start differently, so at most one of them needs
+    to be tried instead of trying each in turn.
+
+    Args:
+        date_str: Date string to inspect
+
+    Returns:
+        Entry of INPUT_DATE_FORMATS, or None if the string fits none of them
+    """
+    for fmt, prefix in INPUT_DATE_FORMATS.items():
+        if prefix.match(date_str):
+            return fmt
 
     return None
 
 
-def validate_date_format(date_str):
+def parse_date_with_multiple_formats(date_str):
     """
-    Validate if date string is in dd/mm/yyyy format.
+    Parse date string in yyyy-mm-dd or mm-dd-yyyy format only.
 
     Args:
-        date_str: Date string to validate
+        date_str: Date string to parse
 
     Returns:
-        tuple: (is_valid, error_message)
+        datetime object or None if parsing fails
     """
+    date_str = str(date_str)
+    fmt = candidate_date_format(date_str)
+    if fmt is None:
+        return None
+
     try:
-        datetime.strptime(str(date_str), '%d/%m/%Y')
-        return True, None
+        return datetime.strptime(date_str, fmt)
     except ValueError:
-        return False, f"Invalid date format: '{date_str}' (expected dd/mm/yyyy)"
+        return None
+
+
+def detect_date_format(date_str):
+    """
+    Detect which supported input format a date string is in.
+
+    Args:
+        date_str: Date string to inspect
+
+    Returns:
+        Matching entry of INPUT_DATE_FORMATS, or None if none matches
+    """
+    if parse_date_with_multiple_formats(date_str) is None:
+        return None
+
+    return candidate_date_format(str(date_str))
+
+
+def parse_date_column(dates, fmt):
+    """
+    Parse a column of date strings in exactly one format.
+
+    Like pd.to_datetime(format=fmt, errors='coerce'), except that the strings
+    'now' and 'today' are rejected as strptime would, instead of being
+    parsed as the current time.
+
+    Args:
+        dates: Series of date strings
+        fmt: strptime format the dates must be in
+
+    Returns:
+        Series of datetime64 values, NaT where a date does not match
+    """
+    parsed = pd.to_datetime(dates, format=fmt, errors='coerce')
+    relative = dates.isin(['now', 'today']).to_numpy()
+    if relative.any():
+        parsed[relative] = pd.NaT
+    return parsed
+
+
+def format_dates(values):
+    """
+    Format datetime64 values as dd/mm/yyyy strings.
+
+    Args:
+        values: NumPy datetime64 array without NaT entries
+
+    Returns:
+        list of dd/mm/yyyy strings
+    """
+    days = values.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    month_nums = months.astype(np.int64) % 12 + 1
+    day_nums = (days - months).astype(np.int64) + 1
+
+    # strftime only for years before 1000, whose padding depends on the platform
+    return [
+        f'{day:02d}/{month:02d}/{year}' if year >= 1000 else datetime(year, month, day).strftime('%d/%m/%Y')
+        for day, month, year in zip(day_nums.tolist(), month_nums.tolist(), years.tolist())
+    ]
 
 
 def standardize_dates(df):
@@ -74,308 +236,535 @@ def standardize_dates(df):
         df: DataFrame with Date column
 
     Returns:
-        tuple: (standardized_df, conversion_report)
+        tuple: (standardized_df, conversion_report, parsed_dates), where
+        parsed_dates holds the dd/mm/yyyy date of each row (NaT where it is
+        not a valid dd/mm/yyyy date)
     """
-    df_std = df.copy()
+    # Missing dates become 'nan', as str() renders them, so that they are
+    # reported and written out as before
+    dates = df['Date'].fillna('nan').astype(str)
+    codes, uniques = pd.factorize(dates)
+    unique_dates = pd.Series(uniques)
+
+    formats = list(INPUT_DATE_FORMATS)
+    detected = detect_date_format(uniques[0]) if len(uniques) else None
+    if detected:
+        formats.remove(detected)
+        formats.insert(0, detected)
+
+    parsed = parse_date_column(unique_dates, formats[0])
+    for fmt in formats[1:]:
+        unparsed = parsed.isna()
+        if not unparsed.any():
+            break
+        parsed[unparsed] = parse_date_column(unique_dates[unparsed], fmt)
+
+    # Dates already written exactly as they would be standardized count
+    # as already standard rather than as errors
+    unparsed = parsed.isna()
+    if unparsed.any():
+        leftover = unique_dates[unparsed]
+        as_output = parse_date_column(leftover, '%d/%m/%Y')
+        standard = as_output.notna().to_numpy(copy=True)
+        standard[standard] = np.array(
+            format_dates(as_output.to_numpy()[standard]), dtype=object) == leftover.to_numpy()[standard]
+        parsed[unparsed] = as_output.where(standard)
+
+    # Convert to dd/mm/yyyy format, keeping the original if parsing fails
+    unique_valid = parsed.notna().to_numpy()
+    unique_standardized = unique_dates.to_numpy(dtype=object, copy=True)
+    unique_standardized[unique_valid] = format_dates(parsed.to_numpy()[unique_valid])
+    unique_already_standard = unique_valid & (unique_standardized == unique_dates.to_numpy())
+
+    # Map the per-date results back onto the rows. The column stays
+    # categorical (distinct inputs may standardize to the same string), so
+    # each distinct date string is stored once rather than once per row.
+    valid = unique_valid[codes]
+    output_codes, output_dates = pd.factorize(unique_standardized)
+    standardized = pd.Series(
+        pd.Categorical.from_codes(output_codes[codes], categories=output_dates), index=df.index)
+
+    # Check if it was already in the standard format
+    already_standard = int(unique_already_standard[codes].sum())
+    error_rows = np.flatnonzero(~valid)
     conversion_report = {
-        'converted': 0,
-        'already_standard': 0,
-        'errors': []
+        'converted': int(valid.sum()) - already_standard,
+        'already_standard': already_standard,
+        'errors': [
+            {'row': idx + 2, 'value': date_str}
+            for idx, date_str in zip(df.index[error_rows].tolist(), unique_dates.to_numpy()[codes[error_rows]].tolist())
+        ]
     }
 
-    standardized_dates = []
-    for idx, date_val in enumerate(df['Date']):
-        date_str = str(date_val)
-        parsed_date = parse_date_with_multiple_formats(date_str)
-
-        if parsed_date:
-            # Convert to dd/mm/yyyy format
-            standardized = parsed_date.strftime('%d/%m/%Y')
-            standardized_dates.append(standardized)
-
-            # Check if it was already in the standard format
-            if date_str == standardized:
-                conversion_report['already_standard'] += 1
-            else:
-                conversion_report['converted'] += 1
-        else:
-            # Keep original if parsing fails
-            standardized_dates.append(date_str)
-            conversion_report['errors'].append({
-                'row': idx + 2,
-                'value': date_str
-            })
+    # Dates left as they were may already be valid dd/mm/yyyy output, and
+    # years before 1000 may have been written without the padding that
+    # dd/mm/yyyy needs, so those output strings are parsed to check them
+    output_parsed = parsed.copy()
+    recheck = ~unique_valid | (parsed.dt.year < 1000).to_numpy()
+    if recheck.any():
+        output_parsed[recheck] = parse_date_column(pd.Series(unique_standardized[recheck]), '%d/%m/%Y').to_numpy()
+    parsed_dates = pd.Series(output_parsed.to_numpy()[codes], index=df.index)
 
-    df_std['Date'] = standardized_dates
-    return df_std, conversion_report
+    # Only the Date column is replaced; under Copy-on-Write the data columns
+    # are shared with df
+    return df.assign(Date=standardized), conversion_report, parsed_dates
 
 
-def check_date_column(df):
+def check_date_column(df, parsed_dates=None):
     """
     Check all dates in the Date column for correct format.
 
     Args:
         df: DataFrame with Date column
+        parsed_dates: Optional dd/mm/yyyy dates from standardize_dates;
+            the column is parsed here when they are not given
 
     Returns:
         tuple: (all_valid, error_list)
     """
-    errors = []
-    for idx, date_val in enumerate(df['Date']):
-        is_valid, error_msg = validate_date_format(str(date_val))
-        if not is_valid:
-            errors.append(f"Row {idx + 2}: {error_msg}")  # +2 for header and 0-indexing
-
-    return len(errors) == 0, errors
+    dates = df['Date']
+    if parsed_dates is None:
+        parsed_dates = parse_date_column(dates, '%d/%m/%Y')
+    invalid = parsed_dates.isna().to_numpy()
+    if not invalid.any():
+        return True, []
+
+    errors = [
+        f"Row {idx + 2}: Invalid date format: '{date_val}' (expected dd/mm/yyyy)"  # +2 for header and 0-indexing
+        for idx, date_val in zip(df.index[invalid].tolist(), dates[invalid].astype(str).tolist())
+    ]
+    return False, errors
 
 
-def check_timeseries_sequence(df):
+def check_timeseries_sequence(df, previous_date=None, parsed_dates=None):
     """
     Check if dates are in chronological timeseries sequence.
     Expects dates in dd/mm/yyyy format.
 
     Args:
         df: DataFrame with Date column in dd/mm/yyyy format
+        previous_date: Optional last valid date before the first row, when
+            checking a file chunk by chunk
+        parsed_dates: Optional dd/mm/yyyy dates from standardize_dates;
+            the column is parsed here when they are not given
 
     Returns:
-        tuple: (is_sequential, sequence_report)
+        tuple: (is_sequential, sequence_report); the report's last_date is
+        the last valid date, to be passed on to the next chunk
     """
     report = {
         'is_sequential': True,
         'total_dates': len(df),
-        'out_of_order': []
+        'out_of_order': [],
+        'last_date': previous_date
     }
 
     # Parse all dates (expecting dd/mm/yyyy format after standardization)
-    dates = []
-    for idx, date_str in enumerate(df['Date']):
-        try:
-            parsed = datetime.strptime(str(date_str), '%d/%m/%Y')
-            dates.append((idx, parsed))
-        except ValueError:
-            report['is_sequential'] = False
-            report['out_of_order'].append({
-                'row': idx + 2,
-                'reason': f'Cannot parse date: {date_str}'
-            })
-
-    # Check if dates are in ascending order
-    for i in range(len(dates) - 1):
-        curr_idx, curr_date = dates[i]
-        next_idx, next_date = dates[i + 1]
-
-        if curr_date > next_date:
-            report['is_sequential'] = False
-            report['out_of_order'].append({
-                'row': next_idx + 2,
-                'reason': f'Date {next_date.strftime("%d/%m/%Y")} comes before previous date {curr_date.strftime("%d/%m/%Y")}'
-            })
+    dates = df['Date']
+    parsed = parsed_dates if parsed_dates is not None else parse_date_column(dates, '%d/%m/%Y')
+    unparsed = parsed.isna().to_numpy()
+    report['out_of_order'] = [
+        {'row': idx + 2, 'reason': f'Cannot parse date: {date_str}'}
+        for idx, date_str in zip(df.index[unparsed].tolist(), dates[unparsed].tolist())
+    ]
 
+    # Compare each valid date with the previous valid one as int64 ticks
+    positions = np.flatnonzero(~unparsed) if unparsed.any() else None
+    valid = parsed.to_numpy()
+    if positions is not None:
+        valid = valid[positions]
+    valid = valid.astype('datetime64[us]', copy=False)
+    if previous_date is not None:
+        valid = np.r_[np.datetime64(previous_date, 'us'), valid]
+    ticks = valid.view(np.int64)
+    later = np.flatnonzero(ticks[1:] < ticks[:-1]) + 1
+
+    # Only the offending rows are looked up and converted back to datetimes
+    offsets = later - 1 if previous_date is not None else later
+    if positions is not None:
+        offsets = positions[offsets]
+    rows = df.index[offsets].tolist()
+    for row, curr_date, next_date in zip(rows, valid[later - 1].tolist(), valid[later].tolist()):
+        report['out_of_order'].append({
+            'row': row + 2,
+            'reason': f'Date {next_date.strftime("%d/%m/%Y")} comes before previous date {curr_date.strftime("%d/%m/%Y")}'
+        })
+
+    report['is_sequential'] = not report['out_of_order']
+    if valid.size:
+        report['last_date'] = valid[-1].tolist()
     return report['is_sequential'], report
 
 
-def count_consecutive_missing(series, index):
+def impute_column(values, max_consecutive, first_row=0, open_start=None, open_end=False):
     """
-    Count consecutive missing values at a given position.
+    Impute small gaps in a single column.
 
     Args:
-        series: Pandas Series
-        index: Current index position
+        values: NumPy array with one column of stock data (not modified)
+        max_consecutive: Maximum number of consecutive missing values to impute
+        first_row: Row position of values[0] in the file, for the report
+        open_start: Row position where a gap that continues into values[0]
+            began, when cleaning a file chunk by chunk; that gap is already
+            too long to impute
+        open_end: Whether a gap reaching values[-1] continues past it; such
+            a gap must already be too long to impute, and is left out of the
+            report until the chunk it ends in
 
     Returns:
-        int: Count of consecutive missing values
+        tuple: (imputed_values or None if nothing was imputed,
+                imputed_positions, not_imputed_positions)
     """
-    count = 0
-    for i in range(index, len(series)):
-        if pd.isna(series.iloc[i]):
-            count += 1
-        else:
-            break
-    return count
+    # Run-length encode the missing mask
+    missing = pd.isna(values)
+    if not missing.any():
+        return None, [], []
+
+    # Boundaries of the runs alternate start, end
+    boundaries = np.flatnonzero(np.diff(np.r_[0, missing.view(np.int8), 0]))
+    starts, ends = boundaries[0::2], boundaries[1::2]
+    lengths = ends - starts
+    small = lengths <= max_consecutive
+
+    # Gaps running into or out of this chunk are too long to impute
+    continued = open_start is not None and starts[0] == 0
+    if continued:
+        small[0] = False
+    unfinished = open_end and ends[-1] == len(values)
+    if unfinished:
+        small[-1] = False
+
+    # Forward fill from the value before each gap; gaps at the start of
+    # the series are backfilled from the value after them instead
+    imputed = None
+    if small.any():
+        fill_starts, fill_ends = starts[small], ends[small]
+        imputed = values.copy()
+        source = np.where(fill_starts > 0, fill_starts - 1, np.minimum(fill_ends, len(missing) - 1))
+
+        # Missing cells appear in run order, so each run's verdict repeats
+        # over its length
+        impute_mask = missing.copy()
+        impute_mask[missing] = np.repeat(small, lengths)
+        imputed[impute_mask] = np.repeat(values[source], lengths[small])
+
+    # Report rows are 1-based and offset by the header line
+    starts, ends = starts + first_row, ends + first_row
+    if continued:
+        starts[0] = open_start
+    if unfinished:
+        starts, ends, small = starts[:-1], ends[:-1], small[:-1]
+    lengths = ends - starts
+    imputed_positions = [
+        {'rows': f"{start + 2}-{end + 1}" if count > 1 else str(start + 2), 'count': count}
+        for start, end, count in zip(starts[small].tolist(), ends[small].tolist(), lengths[small].tolist())
+    ]
+    not_imputed_positions = [
+        {'rows': f"{start + 2}-{end + 1}", 'count': count}
+        for start, end, count in zip(starts[~small].tolist(), ends[~small].tolist(), lengths[~small].tolist())
+    ]
+
+    return imputed, imputed_positions, not_imputed_positions
 
 
-def impute_missing_values(df, max_consecutive=2):
+def impute_missing_values(df, max_consecutive=2, open_runs=None, open_end=False):
     """
     Impute missing values using forward fill and backfill for small gaps.
 
-    Only imputes if there are 1-2 consecutive missing values.
-    Larger gaps are left as-is and reported.
+    Only imputes gaps of at most max_consecutive missing values (1-2 by
+    default). Larger gaps are left as-is and reported.
 
     Args:
         df: DataFrame with stock data
         max_consecutive: Maximum number of consecutive missing values to impute
+        open_runs: Optional {column: row} of the gaps that began before df
+            and continue into its first row, when cleaning a file chunk by
+            chunk
+        open_end: Whether gaps reaching df's last row continue past it
 
     Returns:
         tuple: (cleaned_df, imputation_report)
     """
-    df_clean = df.copy()
     report = {
         'imputed': {},
         'not_imputed': {}
     }
+    # Only columns that actually get imputed are replaced; under Copy-on-Write
+    # the rest are shared
+    updates = {}
+
+    # Process each column except Date, skipping complete columns (O(1) for
+    # Arrow-backed columns via null_count). Workers only see plain column
+    # arrays; pandas objects are rebuilt here with the original dtypes.
+    columns = {col: df[col].to_numpy() for col in df.columns if col != 'Date' and df[col].hasnans}
+    # Report rows follow the frame's index, so chunks report file rows
+    first_row = df.index[0] if len(df) else 0
+    # Columns are independent and the NumPy work releases the GIL
+    with ThreadPoolExecutor() as executor:
+        open_starts = [(open_runs or {}).get(col) for col in columns]
+        results = executor.map(impute_column, columns.values(), repeat(max_consecutive), repeat(first_row),
+                               open_starts, repeat(open_end))
+
+        for col, (imputed, imputed_positions, not_imputed_positions) in zip(columns, results):
+            if imputed is not None:
+                updates[col] = pd.Series(imputed, index=df.index, dtype=df[col].dtype)
+            if imputed_positions:
+                report['imputed'][col] = imputed_positions
+            if not_imputed_positions:
+                report['not_imputed'][col] = not_imputed_positions
+
+    df_clean = df.assign(**updates) if updates else df
+    return df_clean, report
 
-    # Process each column except Date
-    for col in df_clean.columns:
-        if col == 'Date':
-            continue
-
-        imputed_positions = []
-        not_imputed_positions = []
-
-        # Find missing values
-        missing_mask = df_clean[col].isna()
-        missing_indices = missing_mask[missing_mask].index.tolist()
-
-        if not missing_indices:
-            continue
-
-        # Group consecutive missing values
-        i = 0
-        while i < len(missing_indices):
-            start_idx = missing_indices[i]
-            consecutive_count = 1
-
-            # Count consecutive missing
-            while i + 1 < len(missing_indices) and missing_indices[i + 1] == missing_indices[i] + 1:
-                consecutive_count += 1
-                i += 1
-
-            end_idx = missing_indices[i]
-
-            # Impute if within threshold
-            if consecutive_count <= max_consecutive:
-                # Get the range including context for filling
-                context_start = max(0, start_idx - 1)
-                context_end = min(len(df_clean) - 1, end_idx + 1)
-
-                # Create a temporary series with context
-                temp_series = df_clean.loc[context_start:context_end, col].copy()
-
-                # Apply forward fill first
-                temp_series = temp_series.ffill()
-
-                # Then backfill any remaining (handles start of series)
-                temp_series = temp_series.bfill()
-
-                # Update only the missing values range
-                df_clean.loc[start_idx:end_idx, col] = temp_series.loc[start_idx:end_idx]
-
-                imputed_positions.append({
-                    'rows': f"{start_idx + 2}-{end_idx + 2}" if start_idx != end_idx else str(start_idx + 2),
-                    'count': consecutive_count
-                })
-            else:
-                not_imputed_positions.append({
-                    'rows': f"{start_idx + 2}-{end_idx + 2}",
-                    'count': consecutive_count
-                })
 
-            i += 1
+def clean_in_chunks(input_file, output_file, max_consecutive, chunksize, validate_dates=True, use_pyarrow=True):
+    """
+    Clean a stock CSV chunk by chunk, writing the output as it goes.
 
-        if imputed_positions:
-            report['imputed'][col] = imputed_positions
-        if not_imputed_positions:
-            report['not_imputed'][col] = not_imputed_positions
+    Args:
+        input_file: Input CSV file path
+        output_file: Output CSV file path
+        max_consecutive: Maximum number of consecutive missing values to impute
+        chunksize: Number of rows to read at a time
+        validate_dates: Whether to validate the standardized date format
+        use_pyarrow: Whether to try writing the file with pyarrow
 
-    return df_clean, report
+    Returns:
+        tuple: (row_count, date_conversion_report, date_errors, timeseries_report,
+                imputation_report, missing_before, missing_after)
+    """
+    columns = pd.read_csv(input_file, nrows=0).columns
+    data_cols = [col for col in columns if col != 'Date']
+
+    date_conversion_report = {'converted': 0, 'already_standard': 0, 'errors': []}
+    date_errors = []
+    timeseries_report = {'is_sequential': True, 'total_dates': 0, 'out_of_order': [], 'last_date': None}
+    unparsed_dates = []
+    imputation_report = {'imputed': {}, 'not_imputed': {}}
+    missing_before = dict.fromkeys(data_cols, 0)
+    missing_after = dict.fromkeys(data_cols, 0)
+    row_count = 0
+
+    dtypes = None
+    open_runs = {}
+    use_pyarrow = use_pyarrow and pa is not None
+
+    def write_rows(rows, carried, f, open_end):
+        nonlocal open_runs
+        rows_clean, report = impute_missing_values(rows, max_consecutive, open_runs, open_end)
+        for key in ('imputed', 'not_imputed'):
+            for col, positions in report[key].items():
+                imputation_report[key].setdefault(col, []).extend(positions)
+
+        # Gaps reaching the last row continue into the next batch, which
+        # starts with that row
+        if open_end:
+            last_missing = rows[data_cols].iloc[-1].isna()
+            runs = {}
+            for col in last_missing.index[last_missing.to_numpy()]:
+                present = np.flatnonzero(rows[col].notna().to_numpy())
+                runs[col] = rows.index[present[-1] + 1] if present.size else open_runs.get(col, rows.index[0])
+            open_runs = runs
+
+        # The carried row was already written with the previous batch
+        if carried:
+            rows_clean = rows_clean.iloc[1:]
+        for col, count in rows_clean[data_cols].isna().sum().items():
+            missing_after[col] += int(count)
+        # Tell whether the rows went through the same writer as the rest
+        return write_stock_csv(rows_clean, f, header=False, use_pyarrow=use_pyarrow) == use_pyarrow
+
+    # Write through a large buffer to cut down on write calls
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        write_stock_csv(pd.DataFrame(columns=columns), f)
+
+        pending = None
+        carried = False
+        complete = True
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            row_count += len(chunk)
+            if dtypes is None:
+                # Later chunks may have gaps, so the dtypes must hold NaN
+                dtypes = {}
+                for col in data_cols:
+                    dtypes[col] = chunk[col].dtype
+                    if pd.api.types.is_integer_dtype(chunk[col]):
+                        dtypes[col] = np.dtype(np.float64)
+                    elif pd.api.types.is_bool_dtype(chunk[col]):
+                        dtypes[col] = np.dtype(object)
+            for col, dtype in dtypes.items():
+                if chunk[col].dtype != dtype:
+                    try:
+                        chunk[col] = chunk[col].astype(dtype)
+                    except (TypeError, ValueError):
+                        # Values this dtype cannot hold are written as read
+                        pass
+            for col, count in chunk[data_cols].isna().sum().items():
+                missing_before[col] += int(count)
+
+            chunk, report, parsed_dates = standardize_dates(chunk)
+            date_conversion_report['converted'] += report['converted']
+            date_conversion_report['already_standard'] += report['already_standard']
+            date_conversion_report['errors'].extend(report['errors'])
+
+            if validate_dates:
+                date_errors.extend(check_date_column(chunk, parsed_dates)[1])
+
+            report = check_timeseries_sequence(chunk, timeseries_report['last_date'], parsed_dates)[1]
+            timeseries_report['is_sequential'] &= report['is_sequential']
+            timeseries_report['total_dates'] += report['total_dates']
+            timeseries_report['last_date'] = report['last_date']
+            for issue in report['out_of_order']:
+                if issue['reason'].startswith('Cannot parse date'):
+                    unparsed_dates.append(issue)
+                else:
+                    timeseries_report['out_of_order'].append(issue)
+
+            # Everything up to the last settled row can be imputed and written
+            pending = chunk if pending is None else pd.concat([pending, chunk])
+            settled = pending[data_cols].notna().to_numpy(copy=True)
+            for j, col in enumerate(data_cols):
+                present = np.flatnonzero(settled[:, j])
+                gap_start = present[-1] + 1 if present.size else 0
+                if len(pending) - gap_start > max_consecutive or (gap_start == 0 and col in open_runs):
+                    settled[gap_start:, j] = True
+            settled_rows = np.flatnonzero(settled.all(axis=1))
+            if settled_rows.size:
+                split = settled_rows[-1]
+                complete = write_rows(pending.iloc[:split + 1], carried, f, open_end=True)
+                if not complete:
+                    break
+                pending, carried = pending.iloc[split:], True
+
+        if complete and pending is not None:
+            complete = write_rows(pending, carried, f, open_end=False)
+
+    # Numbers are spelled differently by the two writers, so a file pyarrow
+    # cannot write in full is written by pandas throughout
+    if not complete:
+        return clean_in_chunks(input_file, output_file, max_consecutive, chunksize, validate_dates,
+                               use_pyarrow=False)
+
+    # List unparsable dates before order issues and columns in file order,
+    # as a whole-file run does
+    timeseries_report['out_of_order'] = unparsed_dates + timeseries_report['out_of_order']
+    for key in ('imputed', 'not_imputed'):
+        imputation_report[key] = {col: imputation_report[key][col] for col in data_cols if col in imputation_report[key]}
+
+    return (row_count, date_conversion_report, date_errors, timeseries_report,
+            imputation_report, missing_before, missing_after)
+
+
+def print_report(date_conversion_report, date_errors, timeseries_report, imputation_report, missing_before, missing_after):
+    """
+    Print validation and cleaning report.
 
+    missing_before and missing_after map each data column to its number of
+    missing values before and after imputation. The report is collected
+    line by line and written to stdout in one call.
+    """
+    lines = []
+    out = lines.append
 
-def print_report(date_conversion_report, date_errors, timeseries_report, imputation_report, original_df, cleaned_df):
-    """Print validation and cleaning report."""
-    print("\n" + "="*70)
-    print("STOCK DATA VALIDATION AND CLEANING REPORT")
-    print("="*70)
+    out("\n" + REPORT_RULE)
+    out("STOCK DATA VALIDATION AND CLEANING REPORT")
+    out(REPORT_RULE)
 
     # Date standardization
-    print("\n1. DATE FORMAT STANDARDIZATION")
-    print("-" * 70)
+    out("\n1. DATE FORMAT STANDARDIZATION")
+    out(SECTION_RULE)
     if date_conversion_report:
         total = date_conversion_report['converted'] + date_conversion_report['already_standard']
-        print(f"✓ Processed {total} dates:")
-        print(f"  - {date_conversion_report['already_standard']} already in dd/mm/yyyy format")
-        print(f"  - {date_conversion_report['converted']} converted to dd/mm/yyyy format")
+        out(f"✓ Processed {total} dates:")
+        out(f"  - {date_conversion_report['already_standard']} already in dd/mm/yyyy format")
+        out(f"  - {date_conversion_report['converted']} converted to dd/mm/yyyy format")
 
         if date_conversion_report['errors']:
-            print(f"\n✗ Failed to parse {len(date_conversion_report['errors'])} date(s):")
-            for error in date_conversion_report['errors'][:10]:
-                print(f"  - Row {error['row']}: {error['value']}")
+            out(f"\n✗ Failed to parse {len(date_conversion_report['errors'])} date(s):")
+            out("\n".join(f"  - Row {error['row']}: {error['value']}"
+                            for error in date_conversion_report['errors'][:10]))
             if len(date_conversion_report['errors']) > 10:
-                print(f"  ... and {len(date_conversion_report['errors']) - 10} more errors")
+                out(f"  ... and {len(date_conversion_report['errors']) - 10} more errors")
 
     # Date validation
-    print("\n2. DATE FORMAT VALIDATION (dd/mm/yyyy)")
-    print("-" * 70)
+    out("\n2. DATE FORMAT VALIDATION (dd/mm/yyyy)")
+    out(SECTION_RULE)
     if not date_errors:
-        print("✓ All dates are in correct format")
+        out("✓ All dates are in correct format")
     else:
-        print(f"✗ Found {len(date_errors)} date format error(s):")
-        for error in date_errors[:10]:  # Show first 10 errors
-            print(f"  - {error}")
+        out(f"✗ Found {len(date_errors)} date format error(s):")
+        out("\n".join(f"  - {error}" for error in date_errors[:10]))  # Show first 10 errors
         if len(date_errors) > 10:
-            print(f"  ... and {len(date_errors) - 10} more errors")
+            out(f"  ... and {len(date_errors) - 10} more errors")
 
     # Timeseries sequence validation
-    print("\n3. TIMESERIES SEQUENCE VALIDATION")
-    print("-" * 70)
+    out("\n3. TIMESERIES SEQUENCE VALIDATION")
+    out(SECTION_RULE)
     if timeseries_report:
         if timeseries_report['is_sequential']:
-            print(f"✓ All {timeseries_report['total_dates']} dates are in chronological order")
+            out(f"✓ All {timeseries_report['total_dates']} dates are in chronological order")
         else:
-            print(f"✗ Found {len(timeseries_report['out_of_order'])} sequence issue(s):")
-            for issue in timeseries_report['out_of_order'][:10]:
-                print(f"  - Row {issue['row']}: {issue['reason']}")
+            out(f"✗ Found {len(timeseries_report['out_of_order'])} sequence issue(s):")
+            out("\n".join(f"  - Row {issue['row']}: {issue['reason']}"
+                            for issue in timeseries_report['out_of_order'][:10]))
             if len(timeseries_report['out_of_order']) > 10:
-                print(f"  ... and {len(timeseries_report['out_of_order']) - 10} more issues")
+                out(f"  ... and {len(timeseries_report['out_of_order']) - 10} more issues")
 
     # Missing values analysis
-    print("\n4. MISSING VALUES ANALYSIS")
-    print("-" * 70)
-
-    columns_to_check = [col for col in original_df.columns if col != 'Date']
-    missing_before = {}
-    missing_after = {}
-
-    for col in columns_to_check:
-        before = original_df[col].isna().sum()
-        after = cleaned_df[col].isna().sum()
-        if before > 0:
-            missing_before[col] = before
-            missing_after[col] = after
-
-    if not missing_before:
-        print("✓ No missing values found in the dataset")
+    out("\n4. MISSING VALUES ANALYSIS")
+    out(SECTION_RULE)
+
+    if not any(missing_before.values()):
+        out("✓ No missing values found in the dataset")
     else:
-        print("Missing values summary:")
-        print(f"\n  {'Column':<15} {'Before':<10} {'After':<10} {'Imputed':<10}")
-        print("  " + "-" * 50)
-        for col in missing_before:
-            before = missing_before[col]
-            after = missing_after[col]
-            imputed = before - after
-            print(f"  {col:<15} {before:<10} {after:<10} {imputed:<10}")
+        out("Missing values summary:")
+        out(f"\n  {'Column':<15} {'Before':<10} {'After':<10} {'Imputed':<10}")
+        out("  " + "-" * 50)
+        for col, before in missing_before.items():
+            if before > 0:
+                after = missing_after[col]
+                out(f"  {col:<15} {before:<10} {after:<10} {before - after:<10}")
 
     # Imputation details
     if imputation_report['imputed']:
-        print("\n5. IMPUTATION DETAILS")
-        print("-" * 70)
-        print("Values imputed using forward fill / backfill:")
+        out("\n5. IMPUTATION DETAILS")
+        out(SECTION_RULE)
+        out("Values imputed using forward fill / backfill:")
         for col, positions in imputation_report['imputed'].items():
-            print(f"\n  {col}:")
-            for pos in positions:
-                print(f"    - Row(s) {pos['rows']}: {pos['count']} value(s) imputed")
+            out(f"\n  {col}:")
+            out("\n".join(f"    - Row(s) {pos['rows']}: {pos['count']} value(s) imputed" for pos in positions))
 
     # Non-imputed gaps
     if imputation_report['not_imputed']:
-        print("\n6. GAPS NOT IMPUTED (>2 consecutive missing values)")
-        print("-" * 70)
-        print("⚠ The following gaps were NOT imputed (manual review recommended):")
+        out("\n6. GAPS NOT IMPUTED (>2 consecutive missing values)")
+        out(SECTION_RULE)
+        out("⚠ The following gaps were NOT imputed (manual review recommended):")
         for col, positions in imputation_report['not_imputed'].items():
-            print(f"\n  {col}:")
-            for pos in positions:
-                print(f"    - Rows {pos['rows']}: {pos['count']} consecutive missing values")
-        print("\nℹ  These larger gaps should be manually reviewed and filled if needed.")
+            out(f"\n  {col}:")
+            out("\n".join(f"    - Rows {pos['rows']}: {pos['count']} consecutive missing values" for pos in positions))
+        out("\nℹ  These larger gaps should be manually reviewed and filled if needed.")
+
+    out("\n" + REPORT_RULE)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def positive_int(value):
+    """
+    Parse a command-line count that must be at least 1.
+
+    Args:
+        value: Command-line argument string
 
-    print("\n" + "="*70)
+    Returns:
+        int value of the argument
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
 
 
 def main():
@@ -393,6 +782,9 @@ Examples:
   # Change maximum consecutive values to impute
   python validate_stock_data.py data.csv -max-consecutive 3
 
+  # Clean a large file 100000 rows at a time
+  python validate_stock_data.py data.csv -chunksize 100000
+
 What this script does:
   1. Standardizes all dates to dd/mm/yyyy format (auto-detects input format)
   2. Validates all dates can be parsed correctly
@@ -422,6 +814,13 @@ What this script does:
         help='Maximum consecutive missing values to impute (default: 2)'
     )
 
+    parser.add_argument(
+        '-chunksize',
+        '--chunksize',
+        type=positive_int,
+        help='Clean the file this many rows at a time to bound memory use (default: whole file)'
+    )
+
     parser.add_argument(
         '--skip-date-validation',
         action='store_true',
@@ -442,71 +841,107 @@ What this script does:
         base_name = os.path.splitext(args.input_file)[0]
         output_file = f"{base_name}_cleaned.csv"
 
-    try:
-        # Read the CSV file
-        print(f"\nReading file: {args.input_file}")
-        df = pd.read_csv(args.input_file)
+    # DataFrame.assign only shares the columns it does not replace under
+    # Copy-on-Write, which is always on from pandas 3
+    if int(pd.__version__.split('.')[0]) < 3:
+        copy_on_write = pd.option_context('mode.copy_on_write', True)
+    else:
+        copy_on_write = contextlib.nullcontext()
 
-        # Validate required columns
-        if 'Date' not in df.columns:
-            print("Error: CSV file must have a 'Date' column")
-            sys.exit(1)
+    with copy_on_write:
+        try:
+            # Read the CSV file; in chunked mode only the header is read up front
+            print(f"\nReading file: {args.input_file}")
+            if args.chunksize:
+                columns = pd.read_csv(args.input_file, nrows=0).columns
+            else:
+                df = read_stock_csv(args.input_file)
+                columns = df.columns
+
+            # Validate required columns
+            if 'Date' not in columns:
+                print("Error: CSV file must have a 'Date' column")
+                sys.exit(1)
+
+            if len(columns) < 2:
+                print("Error: CSV file must have at least one data column besides Date")
+                sys.exit(1)
+
+            if args.chunksize:
+                # Standardize, validate, impute and save each chunk in turn
+                print(f"Cleaning in chunks of {args.chunksize} rows...")
+                (row_count, date_conversion_report, date_errors, timeseries_report,
+                 imputation_report, missing_before, missing_after) = clean_in_chunks(
+                    args.input_file, output_file, args.max_consecutive, args.chunksize,
+                    validate_dates=not args.skip_date_validation)
+                is_sequential = timeseries_report['is_sequential']
+                print(f"✓ Processed {row_count} rows and {len(columns)} columns")
+
+                # Print report
+                print_report(date_conversion_report, date_errors, timeseries_report, imputation_report,
+                             missing_before, missing_after)
+            else:
+                print(f"✓ Loaded {len(df)} rows and {len(df.columns)} columns")
+
+                # Only the per-column counts of the original frame are needed for the
+                # report, so it is not kept alive alongside the cleaned one
+                missing_before = df.drop(columns=['Date']).isna().sum().to_dict()
+
+                # Standardize date formats to dd/mm/yyyy
+                print("Standardizing date formats...")
+                df, date_conversion_report, parsed_dates = standardize_dates(df)
+
+                # Validate date formats after standardization
+                date_errors = []
+                if not args.skip_date_validation:
+                    all_valid, date_errors = check_date_column(df, parsed_dates)
+
+                # Check timeseries sequence
+                print("Checking timeseries sequence...")
+                is_sequential, timeseries_report = check_timeseries_sequence(df, parsed_dates=parsed_dates)
+
+                # Impute missing values
+                df_clean, imputation_report = impute_missing_values(df, args.max_consecutive)
+                del df
+                missing_after = df_clean.drop(columns=['Date']).isna().sum().to_dict()
+                row_count = len(df_clean)
+
+                # Print report
+                print_report(date_conversion_report, date_errors, timeseries_report, imputation_report,
+                             missing_before, missing_after)
+
+                # Save cleaned data
+                # Write through a large buffer to cut down on write calls
+                with open(output_file, 'wb', buffering=1 << 20) as f:
+                    write_stock_csv(df_clean, f)
+
+            print(f"\n✓ Cleaned data saved to: {output_file}")
+            print(f"✓ Output contains {row_count} rows")
+
+            # Exit with error code if there are issues
+            if date_errors or not is_sequential or imputation_report['not_imputed']:
+                print("\n⚠  Warning: Some issues were found. Please review the report above.")
+                if date_errors:
+                    print("   - Date format errors need to be corrected")
+                if not is_sequential:
+                    print("   - Dates are not in chronological timeseries order")
+                if imputation_report['not_imputed']:
+                    print("   - Large gaps in data need manual review")
+                sys.exit(0)  # Still exit successfully as we created the cleaned file
+            else:
+                print("\n✓ All validation checks passed!")
 
-        if len(df.columns) < 2:
-            print("Error: CSV file must have at least one data column besides Date")
+        except pd.errors.EmptyDataError:
+            print("Error: The CSV file is empty")
+            sys.exit(1)
+        except pd.errors.ParserError as e:
+            print(f"Error: Failed to parse CSV file: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\nUnexpected error: {e}")
+            import traceback
+            traceback.print_exc()
             sys.exit(1)
-
-        print(f"✓ Loaded {len(df)} rows and {len(df.columns)} columns")
-
-        # Standardize date formats to dd/mm/yyyy
-        print("Standardizing date formats...")
-        df_standardized, date_conversion_report = standardize_dates(df)
-
-        # Validate date formats after standardization
-        date_errors = []
-        if not args.skip_date_validation:
-            all_valid, date_errors = check_date_column(df_standardized)
-
-        # Check timeseries sequence
-        print("Checking timeseries sequence...")
-        is_sequential, timeseries_report = check_timeseries_sequence(df_standardized)
-
-        # Impute missing values
-        df_clean, imputation_report = impute_missing_values(df_standardized, args.max_consecutive)
-
-        # Print report
-        print_report(date_conversion_report, date_errors, timeseries_report, imputation_report, df, df_clean)
-
-        # Save cleaned data
-        df_clean.to_csv(output_file, index=False)
-
-        print(f"\n✓ Cleaned data saved to: {output_file}")
-        print(f"✓ Output contains {len(df_clean)} rows")
-
-        # Exit with error code if there are issues
-        if date_errors or not is_sequential or imputation_report['not_imputed']:
-            print("\n⚠  Warning: Some issues were found. Please review the report above.")
-            if date_errors:
-                print("   - Date format errors need to be corrected")
-            if not is_sequential:
-                print("   - Dates are not in chronological timeseries order")
-            if imputation_report['not_imputed']:
-                print("   - Large gaps in data need manual review")
-            sys.exit(0)  # Still exit successfully as we created the cleaned file
-        else:
-            print("\n✓ All validation checks passed!")
-
-    except pd.errors.EmptyDataError:
-        print("Error: The CSV file is empty")
-        sys.exit(1)
-    except pd.errors.ParserError as e:
-        print(f"Error: Failed to parse CSV file: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\nUnexpected error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
 
 
 if __name__ == '__main__':